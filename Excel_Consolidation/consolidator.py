@@ -4,16 +4,24 @@ import os
 import shutil
 import datetime
 import xlwings as xw
+from table_schema import META_COLUMNS, is_valid_header, table_columns, data_columns, match_columns, \
+    get_unique_name
 
 class Consolidator:
     '''This class is used to consolidate the files'''
 
-    def __init__(self, base_file: str, report_sheet: str, duplicates: bool):
+    def __init__(self, base_file: str, report_sheet: str, duplicates: bool,
+                 append_mode: bool = False, column_mapping: dict = None,
+                 pending_reports: list = None):
         self.consolidator_file = base_file
         self.report_sheet = report_sheet
         self.enable_duplicates = duplicates
+        self.append_mode = append_mode
+        self.column_mapping = column_mapping or {}
+        self.pending_reports = pending_reports if pending_reports is not None else []
         self.moved = False
         self.is_duplicate = False
+        self.tables = {}
 
     def consolidate(self, file_path: str):
         '''This method is used to consolidate the files
@@ -38,14 +46,32 @@ class Consolidator:
                 print(f"File: {file_path} is a duplicate")
                 return
 
+            if self.append_mode:
+                self.load_tables(target_wb)
+
             for sheet in source_wb.sheets:
+                if self.append_mode:
+                    table_name = self.append_sheet(target_wb, sheet, file_path)
+                    if table_name:
+                        self.register_report(target_wb.sheets[self.report_sheet], file_path,
+                                             table_name, source_sheet=sheet.name)
+                        continue
+
                 new_name = self.get_unique_name(target_wb, sheet.name)
                 sheet.api.Copy(After=target_wb.sheets[-1].api)
                 target_wb.sheets[-1].name = new_name
-                self.register_report(target_wb.sheets[self.report_sheet], file_path, new_name)
+                if self.append_mode:
+                    self.tag_sheet(target_wb.sheets[-1], file_path, sheet.name)
+                self.register_report(target_wb.sheets[self.report_sheet], file_path, new_name,
+                                     source_sheet=sheet.name)
+
+            # Rows of rejected files are written while the workbook is already open
+            written = len(self.pending_reports)
+            self.write_infos(target_wb.sheets[self.report_sheet], self.pending_reports[:written])
 
             source_wb.close()
             target_wb.save()
+            del self.pending_reports[:written]
             target_wb.close()
         except Exception as e:
             print(f"Error: {str(e)}")
@@ -72,16 +98,101 @@ class Consolidator:
     def get_unique_name(self, target_wb: xw.Book, sheet_name: str) -> str:
         '''This method is used to get a unique name for the sheet'''
 
-        existing_names = [sheet.name for sheet in target_wb.sheets]
+        return get_unique_name([sheet.name for sheet in target_wb.sheets], sheet_name)
+
+    def load_tables(self, target_wb: xw.Book):
+        '''This method is used to read the header row of every table in the target workbook'''
+
+        self.tables = {}
+        for sheet in target_wb.sheets:
+            if sheet.name == self.report_sheet:
+                continue
+
+            headers = self.read_header(sheet)
+            if headers and is_valid_header(data_columns(headers)):
+                self.tables[sheet.name] = headers
+
+    def read_header(self, sheet: xw.Sheet):
+        '''This method is used to read the header row of a sheet over the width of its used range
+
+        Returns
+        -------
+        list or None
+            The header names, or None if a column of the used range has no header, since
+            the sheet can not be used as a table then
+        '''
+
+        last_column = sheet.used_range.last_cell.column
+        values = sheet.range((1, 1), (1, last_column)).options(ndim=1).value
+        headers = ["" if header is None else str(header).strip() for header in values]
 
-        if not sheet_name in existing_names:
-            return sheet_name
+        return headers if is_valid_header(headers) else None
 
-        suffix = 1
-        while f"{sheet_name} ({suffix})" in existing_names:
-            suffix += 1
+    def append_sheet(self, target_wb: xw.Book, sheet: xw.Sheet, file_path: str):
+        '''This method is used to append the rows of a sheet to the table with the same header
+
+        Parameters
+        ----------
+        target_wb: xw.Book
+            The consolidation workbook
+        sheet: xw.Sheet
+            The source sheet to be appended
+        file_path: str
+            The file path of the processed file
 
-        return f"{sheet_name} ({suffix})"
+        Returns
+        -------
+        str or None
+            The name of the table the rows were appended to, or None if no table matches
+        '''
+
+        headers = self.read_header(sheet)
+        if headers is None:
+            return None
+
+        for table_name, table_headers in self.tables.items():
+            order = match_columns(headers, table_headers, self.column_mapping)
+            if order is not None:
+                break
+        else:
+            return None
+
+        table = target_wb.sheets[table_name]
+        if tuple(table_headers[-len(META_COLUMNS):]) != META_COLUMNS:
+            table.range((1, len(table_headers) + 1)).value = list(META_COLUMNS)
+            self.tables[table_name] = table_headers + list(META_COLUMNS)
+
+        values = sheet.range((1, 1), sheet.used_range.last_cell).options(ndim=2).value
+        timestamp = datetime.datetime.now()
+        rows = [[row[i] for i in order] + [os.path.basename(file_path), sheet.name, timestamp]
+                for row in values[1:] if any(cell is not None for cell in row)]
+        if rows:
+            last_row = table.used_range.last_cell.row
+            table.range((last_row + 1, 1)).value = rows
+
+        return table_name
+
+    def tag_sheet(self, sheet: xw.Sheet, file_path: str, source_name: str):
+        '''This method is used to turn a copied sheet into a table that later sheets can be
+        appended to'''
+
+        headers = self.read_header(sheet)
+        if headers is None or tuple(headers[-len(META_COLUMNS):]) == META_COLUMNS:
+            return
+
+        mapped = table_columns(headers, self.column_mapping)
+        if mapped != headers:
+            sheet.range("A1").value = mapped
+        headers = mapped
+
+        last_row = sheet.used_range.last_cell.row
+        sheet.range((1, len(headers) + 1)).value = list(META_COLUMNS)
+        if last_row > 1:
+            timestamp = datetime.datetime.now()
+            sheet.range((2, len(headers) + 1)).value = \
+                [[os.path.basename(file_path), source_name, timestamp]] * (last_row - 1)
+
+        self.tables[sheet.name] = headers + list(META_COLUMNS)
 
     def setup_report(self, report_sheet: xw.Sheet):
         '''This method is used to setup the report sheet'''
@@ -92,9 +203,10 @@ class Consolidator:
         report_sheet.range("D1").value = "Status"
         report_sheet.range("E1").value = "Is Duplicate File"
         report_sheet.range("F1").value = "Message"
+        report_sheet.range("G1").value = "Source Sheet"
 
     def register_report(self, report_sheet: xw.Sheet, file_path: str, sheet_name: str,
-                        status: str = "Success", msg: str = ""):
+                        status: str = "Success", msg: str = "", source_sheet: str = ""):
         '''This method is used to register each processed file and sheet to the report
 
         Parameters
@@ -109,6 +221,9 @@ class Consolidator:
             The status of the process
         msg: str
             An additional message of the process
+        source_sheet: str
+            The name of the sheet in the processed file, when it differs from the sheet name
+            in the consolidation file or was appended to a table
         '''
 
         row = report_sheet.range('A2')
@@ -118,7 +233,7 @@ class Consolidator:
         if not self.moved:
             msg = "Sheets copied but failed to move the file"
         row.value = [os.path.basename(file_path), sheet_name,
-                    datetime.datetime.now(), status, self.is_duplicate, msg]
+                    datetime.datetime.now(), status, self.is_duplicate, msg, source_sheet]
 
     def register_info(self, file_path: str, status: str, msg: str):
         '''This method is used to register the info of special cases
@@ -133,6 +248,18 @@ class Consolidator:
             An additional message of the process
         '''
 
+        self.register_infos([(file_path, status, msg, datetime.datetime.now())])
+
+    def register_infos(self, reports: list):
+        '''This method is used to register the info of several special cases at once
+
+        Parameters
+        ----------
+        reports: list
+            The file path, status, message and date and time of each case, the list is
+            emptied once the rows are saved
+        '''
+
         app = None
         try:
             app = xw.App(visible=False)
@@ -144,14 +271,11 @@ class Consolidator:
             ws = wb.sheets[self.report_sheet]
             self.setup_report(ws)
 
-            row = ws.range('A2')
-            if ws.range('A2').value:
-                row = ws.range('A' + str(ws.range('A1').end('down').row + 1))
-
-            full_msg = f"File: {os.path.basename(file_path)}\n{msg}"
-            row.value = ["-", "N/A", datetime.datetime.now(), status, False, full_msg]
+            written = len(reports)
+            self.write_infos(ws, reports[:written])
 
             wb.save()
+            del reports[:written]
             wb.close()
         except Exception as e:
             print(f"Error: {str(e)}")
@@ -159,6 +283,20 @@ class Consolidator:
             if app is not None:
                 app.quit()
 
+    def write_infos(self, report_sheet: xw.Sheet, reports: list):
+        '''This method is used to write the rows of special cases to the report sheet'''
+
+        if not reports:
+            return
+
+        row = report_sheet.range('A2')
+        if report_sheet.range('A2').value:
+            row = report_sheet.range('A' + str(report_sheet.range('A1').end('down').row + 1))
+
+        row.value = [["-", "N/A", date_time, status, False,
+                      f"File: {os.path.basename(file_path)}\n{msg}"]
+                     for file_path, status, msg, date_time in reports]
+
     def check_duplicates(self, target_wb: xw.Book, file_path: str) -> bool:
         '''This method is used to check if the file is a duplicate'''
 
@@ -0,0 +1,59 @@
+'''This module is used to consolidate workbooks from Python code, without Excel'''
+
+import os
+import datetime
+from table_schema import META_COLUMNS, table_columns, match_columns, get_unique_name
+from xlsx_reader import DEFAULT_CACHE_DIR, Table, load_workbook
+
+def consolidate_files(sources: list, column_mapping: dict = None,
+                      cache_dir: str = DEFAULT_CACHE_DIR) -> dict:
+    '''This method is used to consolidate the sheets of several workbooks into tables
+
+    Sheets are merged the same way as the append mode of the Consolidator: the header is
+    row 1 of the sheet, the rows of a sheet whose header matches a consolidated table are
+    appended to it with the source file, source sheet and import time, and any other
+    sheet, including one with blank or duplicate headers, starts a new table.
+
+    Parameters
+    ----------
+    sources: list
+        The file paths of the workbooks or binary file objects with their content
+    column_mapping: dict
+        Optional mapping from source header names to table header names
+    cache_dir: str
+        The folder for the parsed-cache files, None to disable the cache file
+
+    Returns
+    -------
+    dict
+        The consolidated tables by name
+    '''
+
+    timestamp = datetime.datetime.now()
+    consolidated = {}
+
+    for source in sources:
+        if isinstance(source, (str, os.PathLike)):
+            file_name = os.path.basename(source)
+        else:
+            file_name = os.path.basename(getattr(source, "name", "") or "-")
+
+        for sheet_name, table in load_workbook(source, cache_dir).items():
+            if not table.columns:
+                continue
+
+            for name, entry in consolidated.items():
+                order = match_columns(table.columns, entry["columns"], column_mapping)
+                if order is not None:
+                    break
+            else:
+                name = get_unique_name(consolidated, sheet_name)
+                order = list(range(len(table.columns)))
+                entry = consolidated[name] = {
+                    "columns": table_columns(table.columns, column_mapping), "rows": []}
+
+            entry["rows"].extend([row[i] for i in order] + [file_name, sheet_name, timestamp]
+                                 for row in table.rows())
+
+    return {name: Table.from_rows(name, entry["columns"] + list(META_COLUMNS), entry["rows"])
+            for name, entry in consolidated.items()}
@@ -4,7 +4,6 @@ import sys
 import json
 from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QWidget, QFileDialog, QFrame, QCheckBox, QProgressBar, QMessageBox
-from watcher import Watcher
 
 class MainWindow(QMainWindow):
     '''Main window of the application.'''
@@ -26,6 +25,7 @@ class MainWindow(QMainWindow):
         self.progress_bar = None
         self.active = False
         self.watcher = None
+        self.config = {}
 
         self.define_ui()
         self.load_data()
@@ -85,12 +85,12 @@ class MainWindow(QMainWindow):
         '''Load the data from the JSON configuration file.'''
 
         with open("./Resources/config.json", "r", encoding='UTF-8') as file:
-            data = json.load(file)
+            self.config = json.load(file)
 
-        self.sel_folder_text.setText(data["Observe_Folder"])
-        self.pross_folder_text.setText(data["Processed_Folder"])
-        self.not_app_folder_text.setText(data["Not_Applicable_Folder"])
-        self.file_text.setText(data["Consolidation_File"])
+        self.sel_folder_text.setText(self.config["Observe_Folder"])
+        self.pross_folder_text.setText(self.config["Processed_Folder"])
+        self.not_app_folder_text.setText(self.config["Not_Applicable_Folder"])
+        self.file_text.setText(self.config["Consolidation_File"])
 
     def edit_json_field(self, field_name: str, new_value: str):
         '''Edit a given field in the JSON configuration file.
@@ -103,13 +103,10 @@ class MainWindow(QMainWindow):
             The new value to be assigned to the field.
         '''
 
-        with open("Resources/config.json", "r", encoding='UTF-8') as file:
-            data = json.load(file)
-
-        data[field_name] = new_value
+        self.config[field_name] = new_value
 
         with open("Resources/config.json", "w", encoding='UTF-8') as file:
-            json.dump(data, file, indent=4)
+            json.dump(self.config, file, indent=4)
 
     def sel_folder_layout(self) -> QHBoxLayout:
         '''Define the layout for selecting the folder to be observed.
@@ -293,7 +290,14 @@ class MainWindow(QMainWindow):
         self.initiate_process()
 
     def initiate_process(self):
-        '''Initiate the consolidation process.'''
+        '''Initiate the consolidation process.
+
+        The watcher is imported here so that watchdog, xlwings and the consolidation
+        modules are only loaded once the user starts the process, not before the window
+        is shown.
+        '''
+
+        from watcher import Watcher  # pylint: disable=import-outside-toplevel
 
         self.exec_button.setText("Stop")
         self.state_label.setText("State: Processing")
@@ -0,0 +1,220 @@
+'''This module is used to validate the source files before opening them in Excel'''
+
+import os
+import struct
+import hashlib
+import zlib
+import zipfile
+import xml.etree.ElementTree as ET
+
+ZIP_SIGNATURE = b"PK\x03\x04"
+OLE_SIGNATURE = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+END_OF_CHAIN = 0xFFFFFFFE
+MAX_SECTOR = 0xFFFFFFFA
+SHEET_TAG = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}sheet"
+
+_cache = {}
+
+class PreflightResult:
+    '''This class is used to hold the result of the preflight of a file'''
+
+    def __init__(self, valid: bool, file_format: str, sheet_names: list = None, reason: str = ""):
+        self.valid = valid
+        self.file_format = file_format
+        self.sheet_names = sheet_names or []
+        self.reason = reason
+
+def preflight(file_path: str) -> PreflightResult:
+    '''This method is used to check that a file can be opened as a workbook, without
+    loading any cell data
+
+    Parameters
+    ----------
+    file_path: str
+        The file path of the file to be checked
+
+    Returns
+    -------
+    PreflightResult
+        The result of the check, cached by the content hash of the file
+    '''
+
+    extension = os.path.splitext(file_path)[1].lower()
+    try:
+        if os.path.getsize(file_path) == 0:
+            return PreflightResult(False, "empty", reason="The file is empty")
+
+        key = (file_digest(file_path), extension)
+        if key not in _cache:
+            _cache[key] = inspect_file(file_path, extension)
+    except OSError as e:
+        return PreflightResult(False, "unknown", reason=f"The file could not be read: {str(e)}")
+    except (struct.error, zlib.error, ValueError, OverflowError, NotImplementedError,
+            RuntimeError, EOFError) as e:
+        return PreflightResult(False, "unknown", reason=f"The file is corrupt: {str(e)}")
+
+    return _cache[key]
+
+def file_digest(file_path: str) -> str:
+    '''This method is used to get the content hash of a file'''
+
+    digest = hashlib.sha1()
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+def inspect_file(file_path: str, extension: str) -> PreflightResult:
+    '''This method is used to sniff the container of a file and check it against its extension'''
+
+    with open(file_path, "rb") as file:
+        signature = file.read(8)
+
+    if signature.startswith(ZIP_SIGNATURE):
+        if extension == ".xls":
+            return PreflightResult(False, "zip", reason="The file content does not match its "
+                                   "extension: an Open XML workbook saved as .xls")
+        return inspect_zip(file_path, extension)
+
+    if signature == OLE_SIGNATURE:
+        return inspect_ole(file_path, extension)
+
+    return PreflightResult(False, "unknown", reason="The file is not an Excel workbook")
+
+def inspect_zip(file_path: str, extension: str) -> PreflightResult:
+    '''This method is used to check the zip container of an Open XML workbook'''
+
+    try:
+        with zipfile.ZipFile(file_path) as archive:
+            names = set(archive.namelist())
+            if "[Content_Types].xml" not in names:
+                return PreflightResult(False, "zip", reason="The file is a zip archive "
+                                       "but not an Excel workbook")
+
+            part = "xl/workbook.bin" if extension == ".xlsb" else "xl/workbook.xml"
+            if part not in names:
+                return PreflightResult(False, "zip", reason="The file content does not "
+                                       f"match its extension: '{part}' is missing")
+
+            if extension == ".xlsb":
+                return PreflightResult(True, "xlsb")
+
+            with archive.open(part) as workbook:
+                sheet_names = [element.get("name") for _, element in ET.iterparse(workbook)
+                               if element.tag == SHEET_TAG]
+    except (zipfile.BadZipFile, ET.ParseError, KeyError) as e:
+        return PreflightResult(False, "zip", reason=f"The file is corrupt: {str(e)}")
+
+    if not sheet_names:
+        return PreflightResult(False, "zip", reason="The workbook has no sheets")
+
+    return PreflightResult(True, extension.lstrip("."), sheet_names)
+
+def inspect_ole(file_path: str, extension: str) -> PreflightResult:
+    '''This method is used to check the OLE container of a legacy or encrypted workbook
+
+    When the directory can not be fully read the file is passed on as valid, so that Excel
+    decides instead of rejecting a workbook it could open.
+    '''
+
+    with open(file_path, "rb") as file:
+        header = file.read(512)
+        if len(header) < 512:
+            raise EOFError("truncated OLE header")
+
+        sector_shift = struct.unpack_from("<H", header, 30)[0]
+        if sector_shift not in (9, 12):
+            raise ValueError(f"invalid OLE sector shift {sector_shift}")
+        sector_size = 1 << sector_shift
+        mini_cutoff = struct.unpack_from("<I", header, 56)[0]
+
+        streams = read_ole_directory(file, header, sector_size)
+        if streams is None:
+            return PreflightResult(True, "ole")
+
+        if "EncryptedPackage" in streams or "EncryptionInfo" in streams:
+            return PreflightResult(False, "ole", reason="The workbook is password protected")
+
+        book = streams.get("Workbook") or streams.get("Book")
+        if book is None:
+            return PreflightResult(False, "ole", reason="The file is not an Excel workbook")
+
+        if extension != ".xls":
+            return PreflightResult(False, "ole", reason="The file content does not match its "
+                                   f"extension: a legacy .xls workbook saved as {extension}")
+
+        start_sector, size = book
+        if size >= mini_cutoff:
+            file.seek((start_sector + 1) * sector_size)
+            records = file.read(24)
+            if len(records) == 24:
+                bof_size = struct.unpack_from("<H", records, 2)[0]
+                if bof_size == 16 and struct.unpack_from("<H", records, 20)[0] == 0x002F:
+                    return PreflightResult(False, "ole",
+                                           reason="The workbook is password protected")
+
+    return PreflightResult(True, "xls")
+
+def read_ole_directory(file, header: bytes, sector_size: int):
+    '''This method is used to read the directory entries of an OLE container by following
+    the sector allocation table
+
+    Returns
+    -------
+    dict or None
+        The start sector and size of each stream by name, or None if the structure of the
+        container is not valid
+    '''
+
+    def read_sector(sector: int) -> bytes:
+        file.seek((sector + 1) * sector_size)
+        data = file.read(sector_size)
+        if len(data) != sector_size:
+            raise EOFError(f"sector {sector} is out of the file")
+        return data
+
+    # The counts in the header can not be larger than the number of sectors in the file
+    sector_count = os.fstat(file.fileno()).st_size // sector_size
+    fat_count, directory_sector = struct.unpack_from("<II", header, 44)
+    difat_sector, difat_count = struct.unpack_from("<II", header, 68)
+    fat_count = min(fat_count, sector_count)
+    difat_count = min(difat_count, sector_count)
+    per_sector = sector_size // 4
+
+    try:
+        fat_sectors = list(struct.unpack_from("<109I", header, 76))
+        difat_visited = set()
+        for _ in range(difat_count):
+            if difat_sector >= MAX_SECTOR:
+                break
+            if difat_sector in difat_visited:
+                return None
+            difat_visited.add(difat_sector)
+            entries = struct.unpack(f"<{per_sector}I", read_sector(difat_sector))
+            fat_sectors.extend(entries[:-1])
+            difat_sector = entries[-1]
+
+        fat = []
+        for sector in fat_sectors[:fat_count]:
+            fat.extend(struct.unpack(f"<{per_sector}I", read_sector(sector)))
+
+        directory = b""
+        visited = set()
+        sector = directory_sector
+        while sector != END_OF_CHAIN:
+            if sector >= len(fat) or sector in visited:
+                return None
+            visited.add(sector)
+            directory += read_sector(sector)
+            sector = fat[sector]
+    except (EOFError, ValueError, OverflowError, struct.error):
+        return None
+
+    streams = {}
+    for offset in range(0, len(directory) - 127, 128):
+        name_size = min(struct.unpack_from("<H", directory, offset + 64)[0], 64)
+        name = directory[offset:offset + max(name_size - 2, 0)].decode("utf-16-le", "ignore")
+        streams[name] = struct.unpack_from("<II", directory, offset + 116)
+
+    return streams
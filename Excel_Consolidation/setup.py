@@ -3,11 +3,25 @@
 import sys
 from cx_Freeze import setup, Executable
 
+# Qt modules the application never imports, only PyQt6.QtCore, QtGui and QtWidgets are used
+UNUSED_QT_MODULES = [
+    "PyQt6.Qt3DCore", "PyQt6.QtBluetooth", "PyQt6.QtDBus", "PyQt6.QtDesigner", "PyQt6.QtHelp",
+    "PyQt6.QtMultimedia", "PyQt6.QtMultimediaWidgets", "PyQt6.QtNetwork", "PyQt6.QtNfc",
+    "PyQt6.QtOpenGL", "PyQt6.QtOpenGLWidgets", "PyQt6.QtPdf", "PyQt6.QtPdfWidgets",
+    "PyQt6.QtPositioning", "PyQt6.QtPrintSupport", "PyQt6.QtQml", "PyQt6.QtQuick",
+    "PyQt6.QtQuick3D", "PyQt6.QtQuickWidgets", "PyQt6.QtRemoteObjects", "PyQt6.QtSensors",
+    "PyQt6.QtSerialPort", "PyQt6.QtSpatialAudio", "PyQt6.QtSql", "PyQt6.QtSvg",
+    "PyQt6.QtSvgWidgets", "PyQt6.QtTest", "PyQt6.QtTextToSpeech", "PyQt6.QtWebChannel",
+    "PyQt6.QtWebEngineCore", "PyQt6.QtWebEngineWidgets", "PyQt6.QtWebSockets", "PyQt6.QtXml",
+]
+
 # Add any packages or modules that need to be included
 build_exe_options = {
     "packages": ["os", "sys"],  # Include any additional packages here
-    "excludes": [],  # Exclude unnecessary packages
+    # Exclude unnecessary packages, xlwings only uses numpy and pandas when they are installed
+    "excludes": ["tkinter", "numpy", "pandas", "matplotlib", "PIL"] + UNUSED_QT_MODULES,
     "include_files": ["Resources"],  # Include any additional files, like data files or icons
+    "optimize": 1,  # Ship precompiled bytecode without asserts
 }
 
 # Determine the base of the executable
@@ -0,0 +1,99 @@
+'''This module is used to measure the startup time of the application and report the
+    import time of its modules'''
+
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+HEAVY_MODULES = ("xlwings", "watchdog", "watcher", "consolidator")
+
+# Shows the main window and exits as soon as the first frame has been processed
+WINDOW_SCRIPT = '''
+import sys, time
+start = time.perf_counter()
+from PyQt6.QtWidgets import QApplication
+from main import MainWindow
+app = QApplication(sys.argv)
+window = MainWindow()
+window.show()
+app.processEvents()
+print(time.perf_counter() - start)
+print(",".join(name for name in {heavy} if name in sys.modules))
+'''
+
+def run_python(args: list, env: dict = None) -> subprocess.CompletedProcess:
+    '''This method is used to run the current interpreter inside the application folder'''
+
+    return subprocess.run([sys.executable] + args, cwd=APP_DIR, env=env, capture_output=True,
+                          text=True, check=True)
+
+def measure_startup(runs: int, offscreen: bool):
+    '''This method is used to measure the time until the main window is shown
+
+    Parameters
+    ----------
+    runs: int
+        The number of cold starts to measure
+    offscreen: bool
+        Whether to render the window with the offscreen Qt platform
+    '''
+
+    env = dict(os.environ)
+    if offscreen:
+        env["QT_QPA_PLATFORM"] = "offscreen"
+
+    totals = []
+    windows = []
+    loaded = ""
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = run_python(["-c", WINDOW_SCRIPT.format(heavy=HEAVY_MODULES)], env)
+        totals.append(time.perf_counter() - start)
+        lines = result.stdout.splitlines()
+        windows.append(float(lines[-2]))
+        loaded = lines[-1]
+
+    print(f"Cold start to window shown ({runs} runs)")
+    print(f"  process total: median {statistics.median(totals) * 1000:.0f} ms, "
+          f"min {min(totals) * 1000:.0f} ms")
+    print(f"  in process:    median {statistics.median(windows) * 1000:.0f} ms, "
+          f"min {min(windows) * 1000:.0f} ms")
+    print(f"  heavy modules loaded before execution: {loaded or 'none'}")
+
+def report_imports(top: int):
+    '''This method is used to report the modules that take the longest to import
+
+    Parameters
+    ----------
+    top: int
+        The number of modules to list
+    '''
+
+    result = run_python(["-X", "importtime", "-c", "import main"])
+
+    timings = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        own, cumulative, name = line.split(":", 1)[1].split("|")
+        timings.append((int(cumulative), int(own), name.strip()))
+
+    print(f"Slowest imports of main.py (top {top}, cumulative)")
+    for cumulative, own, name in sorted(timings, reverse=True)[:top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {own / 1000:8.1f} ms self  {name}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5, help="number of cold starts to measure")
+    parser.add_argument("--top", type=int, default=15, help="number of imports to report")
+    parser.add_argument("--offscreen", action="store_true",
+                        help="use the offscreen Qt platform, for machines without a display")
+    arguments = parser.parse_args()
+
+    report_imports(arguments.top)
+    print()
+    measure_startup(arguments.runs, arguments.offscreen)
@@ -0,0 +1,94 @@
+'''This module is used to match the header rows of sheets against consolidated tables'''
+
+META_COLUMNS = ("Source File", "Source Sheet", "Imported At")
+
+def normalize_headers(headers: list) -> list:
+    '''This method is used to normalize a header row read from a sheet
+
+    Parameters
+    ----------
+    headers: list
+        The raw values of the header row
+
+    Returns
+    -------
+    list
+        The header names stripped of blanks, with trailing empty cells removed
+    '''
+
+    names = ["" if header is None else str(header).strip() for header in headers]
+    while names and not names[-1]:
+        names.pop()
+
+    return names
+
+def is_valid_header(headers: list) -> bool:
+    '''This method is used to check if a header row can identify a table'''
+
+    return bool(headers) and "" not in headers and len(set(headers)) == len(headers)
+
+def map_headers(headers: list, column_mapping: dict = None) -> list:
+    '''This method is used to rename the headers of a sheet with the column mapping'''
+
+    column_mapping = column_mapping or {}
+    return [column_mapping.get(header, header) for header in headers]
+
+def table_columns(headers: list, column_mapping: dict = None) -> list:
+    '''This method is used to get the header names a new table is created with
+
+    The table keeps the mapped names so that later sheets of the same shape match it after
+    mapping, unless the mapping would leave the table with duplicate headers.
+    '''
+
+    mapped = map_headers(headers, column_mapping)
+    return mapped if is_valid_header(mapped) else list(headers)
+
+def data_columns(target_headers: list) -> list:
+    '''This method is used to get the data columns of a table, without the metadata columns'''
+
+    if tuple(target_headers[-len(META_COLUMNS):]) == META_COLUMNS:
+        return list(target_headers[:-len(META_COLUMNS)])
+
+    return list(target_headers)
+
+def match_columns(source_headers: list, target_headers: list, column_mapping: dict = None):
+    '''This method is used to match the headers of a source sheet to a target table
+
+    Parameters
+    ----------
+    source_headers: list
+        The normalized header row of the source sheet
+    target_headers: list
+        The normalized header row of the target table, metadata columns included
+    column_mapping: dict
+        Optional mapping from source header names to target header names
+
+    Returns
+    -------
+    list or None
+        For each data column of the target table, the index of the source column
+        that feeds it, or None if the headers do not match
+    '''
+
+    mapped = map_headers(source_headers, column_mapping)
+    targets = data_columns(target_headers)
+
+    if not is_valid_header(mapped):
+        return None
+
+    if sorted(mapped) != sorted(targets):
+        return None
+
+    return [mapped.index(header) for header in targets]
+
+def get_unique_name(existing_names, name: str) -> str:
+    '''This method is used to get a name that is not in use, adding a numbered suffix'''
+
+    if not name in existing_names:
+        return name
+
+    suffix = 1
+    while f"{name} ({suffix})" in existing_names:
+        suffix += 1
+
+    return f"{name} ({suffix})"
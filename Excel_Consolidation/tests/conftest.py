@@ -0,0 +1,49 @@
+'''This module is used to set up the fixtures shared by the tests'''
+
+import os
+import sys
+import shutil
+import zipfile
+import pytest
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+import xlsx_reader  # pylint: disable=wrong-import-position
+
+COPA_WORKBOOK = os.path.join(os.path.dirname(APP_DIR), "Copa America Analisis", "Data",
+                             "Data_Copa_America_2024.xlsx")
+
+def rewrite_workbook(path: str, part: str, change):
+    '''Rewrite a part of a workbook with the result of change(text).'''
+
+    with zipfile.ZipFile(path) as archive:
+        parts = {info: archive.read(info.filename) for info in archive.infolist()}
+
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        for info, content in parts.items():
+            if info.filename == part:
+                content = change(content.decode("UTF-8")).encode("UTF-8")
+            archive.writestr(info, content)
+
+@pytest.fixture(autouse=True)
+def clear_memory_cache():
+    '''Start every test without tables cached in memory.'''
+
+    xlsx_reader._memory_cache.clear()  # pylint: disable=protected-access
+    yield
+    xlsx_reader._memory_cache.clear()  # pylint: disable=protected-access
+
+@pytest.fixture
+def workbook(tmp_path):
+    '''Copy of the Copa America workbook that the test can modify.'''
+
+    path = tmp_path / "Data_Copa_America_2024.xlsx"
+    shutil.copyfile(COPA_WORKBOOK, path)
+    return str(path)
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    '''Folder for the parsed-cache files of the test.'''
+
+    return str(tmp_path / "cache")
@@ -0,0 +1,68 @@
+'''Tests for the library consolidation API, using the Copa America workbook as fixture'''
+
+import io
+import re
+from library import consolidate_files
+from table_schema import META_COLUMNS
+from conftest import COPA_WORKBOOK, rewrite_workbook
+
+SHEETS = ["Equipos", "Goleadores", "Asistencias", "Tarjetas", "Partidos"]
+
+def test_consolidate_two_paths(workbook, cache_dir):
+    tables = consolidate_files([COPA_WORKBOOK, workbook], cache_dir=cache_dir)
+
+    assert list(tables) == SHEETS
+    scorers = tables["Goleadores"]
+    assert len(scorers) == 100
+    assert scorers.columns[-3:] == META_COLUMNS
+    assert set(scorers["Source Sheet"]) == {"Goleadores"}
+    assert len(tables["Partidos"]) == 64
+
+def test_consolidate_file_objects():
+    with open(COPA_WORKBOOK, "rb") as file:
+        content = file.read()
+
+    tables = consolidate_files([io.BytesIO(content), io.BytesIO(content)], cache_dir=None)
+
+    assert list(tables) == SHEETS
+    assert len(tables["Goleadores"]) == 100
+    assert len(tables["Partidos"]) == 64
+
+def test_consolidate_with_column_mapping(workbook):
+    tables = consolidate_files([COPA_WORKBOOK, workbook], {"Nombre": "Name"}, None)
+
+    assert list(tables) == SHEETS
+    assert tables["Equipos"].columns[0] == "Name"
+    assert len(tables["Equipos"]) == 32
+
+def test_unmatched_sheets_get_unique_names(workbook):
+    rewrite_workbook(workbook, "xl/sharedStrings.xml",
+                     lambda text: text.replace(">Goles Anotados<", ">Goles<"))
+
+    tables = consolidate_files([COPA_WORKBOOK, workbook], cache_dir=None)
+
+    assert len(tables["Goleadores"]) == 50
+    assert tables["Goleadores (1)"].columns[-4] == "Goles"
+    assert len(tables["Goleadores (1)"]) == 50
+
+def test_blank_header_starts_new_table(workbook):
+    rewrite_workbook(workbook, "xl/worksheets/sheet5.xml",
+                     lambda text: re.sub(r'<c r="B1"[^>]*>.*?</c>', "", text))
+
+    tables = consolidate_files([COPA_WORKBOOK, workbook, workbook], cache_dir=None)
+
+    assert len(tables["Partidos"]) == 32
+    assert len(tables["Partidos (1)"]) == 32
+    assert len(tables["Partidos (2)"]) == 32
+
+def test_bool_columns_stay_bool(workbook):
+    rewrite_workbook(workbook, "xl/worksheets/sheet5.xml",
+                     lambda text: re.sub(r'<c r="E(\d+)"><v>(\d+)</v></c>',
+                                         lambda match: f'<c r="E{match[1]}" t="b"><v>'
+                                                       f'{int(match[2]) % 2}</v></c>', text))
+
+    with open(workbook, "rb") as file:
+        tables = consolidate_files([workbook, io.BytesIO(file.read())], cache_dir=None)
+
+    assert tables["Partidos"].types[4] == "bool"
+    assert set(tables["Partidos"]["No de Partido"]) == {True, False}
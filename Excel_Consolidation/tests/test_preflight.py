@@ -0,0 +1,159 @@
+'''Tests for the preflight of source files, using the Copa America workbook as fixture'''
+
+import struct
+import zipfile
+import pytest
+import preflight
+from conftest import COPA_WORKBOOK
+
+END_OF_CHAIN = 0xFFFFFFFE
+FREE = 0xFFFFFFFF
+
+@pytest.fixture(autouse=True)
+def clear_preflight_cache():
+    '''Start every test without cached preflight results.'''
+
+    preflight._cache.clear()  # pylint: disable=protected-access
+
+def directory_entry(name: str, start: int = 0, size: int = 0) -> bytes:
+    '''Build a 128 byte OLE directory entry.'''
+
+    encoded = (name + "\0").encode("utf-16-le")
+    entry = bytearray(128)
+    entry[:len(encoded)] = encoded
+    struct.pack_into("<H", entry, 64, len(encoded))
+    entry[66] = 5 if name == "Root Entry" else 2
+    struct.pack_into("<II", entry, 116, start, size)
+    return bytes(entry)
+
+def build_ole(names: list, second_record: int = 0x0085, directory_next: int = 2,
+              sector_shift: int = 9, difat: tuple = (END_OF_CHAIN, 0)) -> bytes:
+    '''Build an OLE container with a FAT sector, two directory sectors and a workbook stream.
+
+    The Workbook stream starts with a BOF record followed by ``second_record``.
+    '''
+
+    header = bytearray(512)
+    header[:8] = preflight.OLE_SIGNATURE
+    struct.pack_into("<HHHHH", header, 24, 0x3E, 3, 0xFFFE, sector_shift, 6)
+    struct.pack_into("<II", header, 44, 1, 1)
+    struct.pack_into("<II", header, 56, 4096, END_OF_CHAIN)
+    struct.pack_into("<II", header, 68, *difat)
+    struct.pack_into("<109I", header, 76, 0, *[FREE] * 108)
+
+    fat = [0xFFFFFFFD, directory_next, END_OF_CHAIN, 4, 5, 6, 7, 8, 9, 10, END_OF_CHAIN]
+    fat += [FREE] * (128 - len(fat))
+
+    directory = b"".join(directory_entry(name, 3, 4096) if name in ("Workbook", "EncryptedPackage")
+                         else directory_entry(name) for name in names).ljust(1024, b"\0")
+    workbook = struct.pack("<HH", 0x0809, 16) + b"\0" * 16 + struct.pack("<HH", second_record, 0)
+
+    return bytes(header) + struct.pack("<128I", *fat) + directory + workbook.ljust(4096, b"\0")
+
+def check(tmp_path, file_name: str, content: bytes) -> preflight.PreflightResult:
+    '''Write a file and run the preflight on it.'''
+
+    path = tmp_path / file_name
+    path.write_bytes(content)
+    return preflight.preflight(str(path))
+
+def copa_content() -> bytes:
+    '''Content of the Copa America workbook.'''
+
+    with open(COPA_WORKBOOK, "rb") as file:
+        return file.read()
+
+def test_valid_workbook():
+    result = preflight.preflight(COPA_WORKBOOK)
+
+    assert result.valid
+    assert result.file_format == "xlsx"
+    assert result.sheet_names == ["Equipos", "Goleadores", "Asistencias", "Tarjetas", "Partidos"]
+
+def test_zero_byte_file(tmp_path):
+    result = check(tmp_path, "empty.xlsx", b"")
+
+    assert not result.valid
+    assert result.file_format == "empty"
+
+def test_csv_renamed_to_xlsx(tmp_path):
+    result = check(tmp_path, "data.xlsx", b"a,b\n1,2\n")
+
+    assert not result.valid
+    assert result.reason == "The file is not an Excel workbook"
+
+def test_xlsx_saved_as_xls(tmp_path):
+    result = check(tmp_path, "data.xls", copa_content())
+
+    assert not result.valid
+    assert "does not match its extension" in result.reason
+
+def test_truncated_zip(tmp_path):
+    result = check(tmp_path, "data.xlsx", copa_content()[:300])
+
+    assert not result.valid
+    assert result.reason.startswith("The file is corrupt")
+
+def test_damaged_deflate_stream(tmp_path):
+    content = bytearray(copa_content())
+    with zipfile.ZipFile(COPA_WORKBOOK) as archive:
+        info = archive.getinfo("xl/workbook.xml")
+    offset = info.header_offset + 30 + len(info.filename) + len(info.extra)
+    content[offset + 10:offset + 40] = b"\xff" * 30
+
+    result = check(tmp_path, "data.xlsx", bytes(content))
+
+    assert not result.valid
+    assert result.reason.startswith("The file is corrupt")
+
+def test_workbook_in_second_directory_sector(tmp_path):
+    names = ["Root Entry", "\x05SummaryInformation", "\x05DocumentSummaryInformation",
+             "_VBA_PROJECT_CUR", "Workbook"]
+
+    result = check(tmp_path, "data.xls", build_ole(names))
+
+    assert result.valid
+    assert result.file_format == "xls"
+
+def test_password_protected_xls(tmp_path):
+    result = check(tmp_path, "data.xls", build_ole(["Root Entry", "Workbook"], 0x002F))
+
+    assert not result.valid
+    assert result.reason == "The workbook is password protected"
+
+def test_encrypted_package(tmp_path):
+    names = ["Root Entry", "\x06DataSpaces", "Version", "DataSpaceMap", "DataSpaceInfo",
+             "EncryptionInfo", "EncryptedPackage"]
+
+    result = check(tmp_path, "data.xlsx", build_ole(names))
+
+    assert not result.valid
+    assert result.reason == "The workbook is password protected"
+
+def test_bad_sector_shift(tmp_path):
+    result = check(tmp_path, "data.xls", build_ole(["Root Entry", "Workbook"], sector_shift=60000))
+
+    assert not result.valid
+    assert result.reason.startswith("The file is corrupt")
+
+def test_directory_cycle_is_passed_to_excel(tmp_path):
+    result = check(tmp_path, "data.xls", build_ole(["Root Entry", "Workbook"], directory_next=1))
+
+    assert result.valid
+    assert result.file_format == "ole"
+
+def test_difat_cycle_is_passed_to_excel(tmp_path):
+    content = bytearray(build_ole(["Root Entry", "Workbook"], difat=(11, 0xFFFFFFF0)))
+    difat_sector = [FREE] * 127 + [11]
+    content += struct.pack("<128I", *difat_sector)
+
+    result = check(tmp_path, "data.xls", bytes(content))
+
+    assert result.valid
+    assert result.file_format == "ole"
+
+def test_results_are_cached_by_content(tmp_path):
+    first = check(tmp_path, "a.xlsx", b"a,b\n")
+    second = check(tmp_path, "b.xlsx", b"a,b\n")
+
+    assert first is second
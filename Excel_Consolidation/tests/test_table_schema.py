@@ -0,0 +1,49 @@
+'''Tests for the header matching of the append mode'''
+
+from table_schema import META_COLUMNS, normalize_headers, is_valid_header, map_headers, \
+    table_columns, data_columns, match_columns, get_unique_name
+
+def test_exact_match():
+    assert match_columns(["a", "b", "c"], ["a", "b", "c"]) == [0, 1, 2]
+
+def test_reordered_columns():
+    assert match_columns(["c", "a", "b"], ["a", "b", "c"]) == [1, 2, 0]
+
+def test_different_columns_do_not_match():
+    assert match_columns(["a", "b"], ["a", "b", "c"]) is None
+    assert match_columns(["a", "b", "d"], ["a", "b", "c"]) is None
+
+def test_mapping():
+    mapping = {"Nombre": "Name"}
+
+    assert map_headers(["Nombre", "Equipo"], mapping) == ["Name", "Equipo"]
+    assert match_columns(["Equipo", "Nombre"], ["Name", "Equipo"], mapping) == [1, 0]
+    assert match_columns(["Name", "Equipo"], ["Name", "Equipo"], mapping) == [0, 1]
+    assert match_columns(["Nombre", "Equipo"], ["Nombre", "Equipo"], mapping) is None
+
+def test_trailing_metadata_columns():
+    target = ["a", "b"] + list(META_COLUMNS)
+
+    assert data_columns(target) == ["a", "b"]
+    assert data_columns(["a", "b"]) == ["a", "b"]
+    assert match_columns(["b", "a"], target) == [1, 0]
+
+def test_duplicate_headers():
+    assert not is_valid_header(["a", "a"])
+    assert match_columns(["a", "a"], ["a", "a"]) is None
+    assert match_columns(["x", "y"], ["a", "y"], {"x": "y"}) is None
+
+def test_blank_headers():
+    assert normalize_headers([" a ", None, "c", None, ""]) == ["a", "", "c"]
+    assert not is_valid_header(["a", "", "c"])
+    assert not is_valid_header([])
+    assert match_columns(["a", "", "c"], ["a", "", "c"]) is None
+
+def test_table_columns():
+    assert table_columns(["Nombre", "Equipo"], {"Nombre": "Name"}) == ["Name", "Equipo"]
+    assert table_columns(["Nombre", "Name"], {"Nombre": "Name"}) == ["Nombre", "Name"]
+    assert table_columns(["a", "b"]) == ["a", "b"]
+
+def test_get_unique_name():
+    assert get_unique_name(["Data"], "Other") == "Other"
+    assert get_unique_name(["Data", "Data (1)"], "Data") == "Data (2)"
@@ -0,0 +1,164 @@
+'''Tests for the cached xlsx reader, using the Copa America workbook as fixture'''
+
+import os
+import re
+import io
+import datetime
+import pytest
+import xlsx_reader
+from conftest import COPA_WORKBOOK, rewrite_workbook
+
+@pytest.fixture
+def count_calls(monkeypatch):
+    '''Count the calls to the parse and read functions of the reader.'''
+
+    calls = {"parse": 0, "read": 0}
+    parse, read = xlsx_reader.parse_workbook, xlsx_reader.read_file
+
+    def counted_parse(file):
+        calls["parse"] += 1
+        return parse(file)
+
+    def counted_read(file_path):
+        calls["read"] += 1
+        return read(file_path)
+
+    monkeypatch.setattr(xlsx_reader, "parse_workbook", counted_parse)
+    monkeypatch.setattr(xlsx_reader, "read_file", counted_read)
+    return calls
+
+def test_sheets_columns_and_types():
+    tables = xlsx_reader.load_workbook(COPA_WORKBOOK, None)
+
+    assert list(tables) == ["Equipos", "Goleadores", "Asistencias", "Tarjetas", "Partidos"]
+
+    scorers = tables["Goleadores"]
+    assert len(scorers) == 50
+    assert scorers.columns == ("POS", "Nombre", "Equipo", "Partidos Jugados", "Goles Anotados")
+    assert scorers.types == ("int", "str", "str", "int", "int")
+
+    matches = tables["Partidos"]
+    assert len(matches) == 32
+    assert matches.columns == ("Equipo 1", "Equipo 2", "Resultado", "Fase", "No de Partido")
+    assert matches.types == ("str", "str", "str", "str", "int")
+    assert next(iter(matches.rows())) == ("Argentina", "Canadá", "2-0", "Fase de Grupos", 1)
+
+def test_tables_are_read_only():
+    tables = xlsx_reader.load_workbook(COPA_WORKBOOK, None)
+    goals = tables["Goleadores"]["Goles Anotados"]
+
+    with pytest.raises(TypeError):
+        goals[0] = 0
+    tables.pop("Goleadores")
+
+    assert "Goleadores" in xlsx_reader.load_workbook(COPA_WORKBOOK, None)
+
+def test_cold_load_then_cache_file_and_memory_hits(workbook, cache_dir, count_calls,
+                                                   monkeypatch):
+    cold = xlsx_reader.load_workbook(workbook, cache_dir)
+    assert count_calls == {"parse": 1, "read": 1}
+    assert len(os.listdir(cache_dir)) == 1
+
+    xlsx_reader._memory_cache.clear()  # pylint: disable=protected-access
+    from_file = xlsx_reader.load_workbook(workbook, cache_dir)
+    assert count_calls == {"parse": 1, "read": 1}
+    assert list(from_file["Goleadores"].rows()) == list(cold["Goleadores"].rows())
+    assert from_file["Goleadores"].types == cold["Goleadores"].types
+
+    def no_cache_lookup(*args):
+        raise AssertionError("The tables should come from memory")
+
+    monkeypatch.setattr(xlsx_reader, "load_cached", no_cache_lookup)
+    from_memory = xlsx_reader.load_workbook(workbook, cache_dir)
+    assert from_memory["Partidos"] is from_file["Partidos"]
+
+def test_cache_invalidation(workbook, cache_dir, count_calls):
+    xlsx_reader.load_workbook(workbook, cache_dir)
+
+    stat = os.stat(workbook)
+    os.utime(workbook, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    xlsx_reader.load_workbook(workbook, cache_dir)
+    assert count_calls == {"parse": 1, "read": 2}
+
+    rewrite_workbook(workbook, "xl/sharedStrings.xml",
+                     lambda text: text.replace(">Argentina<", ">Argentina Campeón<"))
+    tables = xlsx_reader.load_workbook(workbook, cache_dir)
+    assert count_calls == {"parse": 2, "read": 3}
+    assert tables["Partidos"]["Equipo 1"][0] == "Argentina Campeón"
+
+    xlsx_reader._memory_cache.clear()  # pylint: disable=protected-access
+    tables = xlsx_reader.load_workbook(workbook, cache_dir)
+    assert count_calls == {"parse": 2, "read": 3}
+    assert tables["Partidos"]["Equipo 1"][0] == "Argentina Campeón"
+
+def test_invalid_cache_file_is_ignored(workbook, cache_dir, count_calls):
+    xlsx_reader.load_workbook(workbook, cache_dir)
+    cache_file = os.path.join(cache_dir, os.listdir(cache_dir)[0])
+    with open(cache_file, "w", encoding="UTF-8") as file:
+        file.write("[1, 2, 3]")
+
+    xlsx_reader._memory_cache.clear()  # pylint: disable=protected-access
+    tables = xlsx_reader.load_workbook(workbook, cache_dir)
+    assert count_calls["parse"] == 2
+    assert len(tables["Goleadores"]) == 50
+
+def test_file_like_source(cache_dir):
+    with open(COPA_WORKBOOK, "rb") as file:
+        tables = xlsx_reader.load_workbook(io.BytesIO(file.read()), cache_dir)
+
+    assert len(tables["Asistencias"]) == 50
+
+def test_cells_without_references(workbook):
+    rewrite_workbook(workbook, "xl/worksheets/sheet5.xml",
+                     lambda text: re.sub(r' r="[A-Z]*[0-9]+"', "", text))
+
+    matches = xlsx_reader.load_workbook(workbook, None)["Partidos"]
+    assert len(matches) == 32
+    assert matches.columns[0] == "Equipo 1"
+    assert next(iter(matches.rows())) == ("Argentina", "Canadá", "2-0", "Fase de Grupos", 1)
+
+def test_to_column_types():
+    assert xlsx_reader.to_column([1, 2])[1] == "int"
+    assert xlsx_reader.to_column([1, None, 2.5])[1] == "float"
+    assert xlsx_reader.to_column([True, False])[1] == "bool"
+    assert xlsx_reader.to_column([datetime.datetime(2024, 7, 14), None])[1] == "datetime"
+    assert xlsx_reader.to_column(["a", 1])[1] == "object"
+
+def test_bool_round_trip(tmp_path):
+    table = xlsx_reader.Table.from_rows("Flags", ["Flag"], [[True], [False]])
+    assert table.types == ("bool",)
+    assert list(table.rows()) == [(True,), (False,)]
+
+    again = xlsx_reader.Table.from_rows("Flags", ["Flag"], list(table.rows()))
+    assert again.types == ("bool",)
+
+    cached = xlsx_reader.Table.from_json(table.to_json())
+    assert cached.types == ("bool",)
+    assert cached["Flag"] == (True, False)
+
+def test_integers_outside_int64(workbook):
+    rewrite_workbook(workbook, "xl/worksheets/sheet5.xml",
+                     lambda text: text.replace('<c r="E2"><v>1</v></c>',
+                                               '<c r="E2"><v>99999999999999999999</v></c>'))
+
+    matches = xlsx_reader.load_workbook(workbook, None)["Partidos"]
+    assert matches.types[4] == "object"
+    assert matches["No de Partido"][0] == 99999999999999999999
+
+def test_iso_date_cells(workbook):
+    rewrite_workbook(workbook, "xl/worksheets/sheet5.xml",
+                     lambda text: re.sub(r'<c r="E(\d+)"><v>\d+</v></c>',
+                                         r'<c r="E\1" t="d"><v>2024-07-14T20:00:00</v></c>',
+                                         text))
+
+    matches = xlsx_reader.load_workbook(workbook, None)["Partidos"]
+    assert matches.types[4] == "datetime"
+    assert matches["No de Partido"][0] == datetime.datetime(2024, 7, 14, 20)
+
+def test_header_is_row_one_without_names_for_blank_headers(workbook):
+    rewrite_workbook(workbook, "xl/worksheets/sheet5.xml",
+                     lambda text: re.sub(r'<c r="B1"[^>]*>.*?</c>', "", text))
+
+    matches = xlsx_reader.load_workbook(workbook, None)["Partidos"]
+    assert matches.columns[:3] == ("Equipo 1", "", "Resultado")
+    assert len(matches) == 32
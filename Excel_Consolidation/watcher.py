@@ -2,13 +2,14 @@
     into a single file'''
 
 import time
-import json
 import os
+import datetime
 import shutil
 from PyQt6.QtCore import QThread, pyqtSignal
 from watchdog.observers import Observer
 from file_handler import FileHandler
 from consolidator import Consolidator
+from preflight import preflight
 
 class Watcher(QThread):
     '''This class is used to watch the folder for any new files and consolidate 
@@ -20,9 +21,7 @@ class Watcher(QThread):
     def __init__(self, main_window):
         super().__init__()
         self.observer = Observer()
-
-        with open("Resources/config.json", "r", encoding='UTF-8') as file:
-            data = json.load(file)
+        data = main_window.config
 
         self.last_err = None
         self.consolidator = None
@@ -31,6 +30,9 @@ class Watcher(QThread):
         self.processed_folder = data["Processed_Folder"]
         self.not_applicable_folder = data["Not_Applicable_Folder"]
         self.report_sheet = data["Report_Sheet"]
+        self.append_mode = data.get("Append_Mode", False)
+        self.column_mapping = data.get("Column_Mapping", {})
+        self.pending_reports = []
         self.main_window = main_window
 
     def run(self):
@@ -57,6 +59,11 @@ class Watcher(QThread):
 
         self.observer.join()
 
+        if self.pending_reports:
+            self.consolidator = Consolidator(
+                self.file_path, self.report_sheet, self.main_window.check_box.isChecked())
+            self.consolidator.register_infos(self.pending_reports)
+
     def process_file(self, file_path: str):
         '''This method is used to process the file'''
 
@@ -64,13 +71,21 @@ class Watcher(QThread):
             self.register_report(file_path, "Failed", "Permission denied")
             return
 
+        result = preflight(file_path)
+        if not result.valid:
+            self.comm_signal.emit(f"State: Moving invalid file '{os.path.basename(file_path)}'")
+            self.move_not_applicable(file_path, "Failed", result.reason)
+            return
+
         self.consolidator = Consolidator(
-            self.file_path, self.report_sheet, self.main_window.check_box.isChecked())
+            self.file_path, self.report_sheet, self.main_window.check_box.isChecked(),
+            self.append_mode, self.column_mapping, self.pending_reports)
         self.consolidator.consolidate(file_path)
         self.consolidator.move_excel(file_path, self.processed_folder)
         self.comm_signal.emit(self.WAIT_MSG)
 
-    def move_not_applicable(self, file_path: str):
+    def move_not_applicable(self, file_path: str, status: str = "Success",
+                            msg: str = "Moved file with file type not supported"):
         '''This method is used to move the file to the not applicable folder'''
 
         if not self.check_permission(file_path, self.not_applicable_folder):
@@ -81,7 +96,8 @@ class Watcher(QThread):
         if os.path.exists(destination):
             os.remove(destination)
         shutil.move(file_path, destination)
-        self.register_report(file_path, "Success", "Moved file with file type not supported")
+        # Written with the next consolidation instead of opening Excel for a single row
+        self.pending_reports.append((file_path, status, msg, datetime.datetime.now()))
         self.comm_signal.emit(self.WAIT_MSG)
 
     def register_report(self, file_path, status, msg):
@@ -0,0 +1,425 @@
+'''This module is used to read Open XML workbooks into typed columnar tables without Excel'''
+
+import io
+import os
+import re
+import json
+import math
+import array
+import hashlib
+import datetime
+import tempfile
+import zipfile
+import posixpath
+import xml.etree.ElementTree as ET
+from table_schema import normalize_headers
+
+MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+PKG_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+DATE_FORMAT_IDS = set(range(14, 23)) | {45, 46, 47}
+CACHE_VERSION = 3
+ARRAY_CODES = {"int": "q", "float": "d"}
+INT64_MIN, INT64_MAX = -2 ** 63, 2 ** 63 - 1
+DEFAULT_CACHE_DIR = os.path.join(
+    os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME")
+    or os.path.join(os.path.expanduser("~"), ".cache"), "Excel Consolidation", "cache")
+
+_memory_cache = {}
+
+class Table:
+    '''This class is used to hold the rows of a sheet as typed, read-only columns
+
+    Integer columns without blanks that fit in 64 bits are stored as ``array('q')``,
+    numeric columns with blanks as ``array('d')`` with NaN for the blanks and every other
+    column as a tuple. The columns are only exposed through indexing by name, numeric ones
+    as read-only memoryviews. The header is the first row of the sheet, and columns without
+    a header have an empty name.
+    '''
+
+    def __init__(self, name: str, columns: list, data: list, types: list):
+        self.name = name
+        self.columns = tuple(columns)
+        self.types = tuple(types)
+        self._data = tuple(data)
+
+    @classmethod
+    def from_rows(cls, name: str, columns: list, rows: list):
+        '''This method is used to build a table from a list of rows
+
+        Parameters
+        ----------
+        name: str
+            The name of the table
+        columns: list
+            The header names of the table
+        rows: list
+            The rows of the table, each one a list with a value per column
+        '''
+
+        data = []
+        types = []
+        for index in range(len(columns)):
+            values = [row[index] if index < len(row) else None for row in rows]
+            column, column_type = to_column(values)
+            data.append(column)
+            types.append(column_type)
+
+        return cls(name, columns, data, types)
+
+    def __len__(self) -> int:
+        return len(self._data[0]) if self._data else 0
+
+    def __getitem__(self, column_name: str):
+        column = self._data[self.columns.index(column_name)]
+        if isinstance(column, array.array):
+            return memoryview(column).toreadonly()
+
+        return column
+
+    def rows(self):
+        '''This method is used to iterate over the table row by row, blanks as None'''
+
+        columns = [[None if isinstance(value, float) and math.isnan(value) else value
+                    for value in column] if column_type == "float" else column
+                   for column, column_type in zip(self._data, self.types)]
+
+        return zip(*columns)
+
+    def to_json(self) -> dict:
+        '''This method is used to convert the table to plain JSON values for the cache file'''
+
+        return {"name": self.name, "columns": list(self.columns), "types": list(self.types),
+                "data": [[encode_value(value) for value in column] for column in self._data]}
+
+    @classmethod
+    def from_json(cls, data: dict):
+        '''This method is used to rebuild a table from the JSON values of the cache file'''
+
+        columns = []
+        for column_type, values in zip(data["types"], data["data"]):
+            if column_type in ARRAY_CODES:
+                columns.append(array.array(ARRAY_CODES[column_type], values))
+            else:
+                columns.append(tuple(decode_value(value) for value in values))
+
+        if len(columns) != len(data["columns"]):
+            raise ValueError("The cached table is incomplete")
+
+        return cls(str(data["name"]), [str(column) for column in data["columns"]], columns,
+                   data["types"])
+
+def encode_value(value):
+    '''This method is used to convert a cell value to a JSON value'''
+
+    if isinstance(value, datetime.datetime):
+        return {"datetime": value.isoformat()}
+
+    return value
+
+def decode_value(value):
+    '''This method is used to convert a JSON value back to a cell value'''
+
+    if isinstance(value, dict):
+        return datetime.datetime.fromisoformat(value["datetime"])
+    if isinstance(value, (list, tuple)):
+        raise ValueError("Unexpected list in a cached column")
+
+    return value
+
+def to_column(values: list):
+    '''This method is used to convert the values of a column to its narrowest type
+
+    Returns
+    -------
+    tuple
+        The column and the name of its type
+    '''
+
+    present = [value for value in values if value is not None]
+    complete = len(present) == len(values)
+
+    if not present:
+        return tuple(values), "empty"
+
+    if all(isinstance(value, bool) for value in present):
+        return tuple(values), "bool" if complete else "object"
+
+    if any(isinstance(value, bool) for value in present):
+        return tuple(values), "object"
+
+    if any(isinstance(value, int) and not INT64_MIN <= value <= INT64_MAX for value in present):
+        return tuple(values), "object"
+
+    if complete and all(isinstance(value, int) for value in present):
+        return array.array("q", values), "int"
+
+    if all(isinstance(value, (int, float)) for value in present):
+        return array.array("d", [math.nan if value is None else value
+                                 for value in values]), "float"
+
+    if all(isinstance(value, datetime.datetime) for value in present):
+        return tuple(values), "datetime"
+
+    if all(isinstance(value, str) for value in present):
+        return tuple(values), "str"
+
+    return tuple(values), "object"
+
+def load_workbook(source, cache_dir: str = DEFAULT_CACHE_DIR) -> dict:
+    '''This method is used to load every sheet of a workbook as a table
+
+    The parsed tables are cached in memory and in a file inside ``cache_dir``. The cache of
+    a path is reused while the modification time and size of the file are unchanged, and
+    otherwise while its content hash is unchanged, so the xlsx is only parsed again when it
+    really changed.
+
+    Parameters
+    ----------
+    source: str or file-like
+        The file path of the workbook or a binary file object with its content
+    cache_dir: str
+        The folder for the parsed-cache files, None to disable the cache file
+
+    Returns
+    -------
+    dict
+        The read-only tables of the workbook by sheet name, in the order of the sheets
+    '''
+
+    if not isinstance(source, (str, os.PathLike)):
+        content = source.read()
+        digest = hashlib.sha1(content).hexdigest()
+        return load_cached(digest, digest, None, lambda: content, cache_dir)
+
+    file_path = os.path.abspath(source)
+    stat = os.stat(file_path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    key = hashlib.sha1(file_path.encode("UTF-8")).hexdigest()
+
+    cached = _memory_cache.get(key)
+    if cached is not None and cached["signature"] == signature:
+        return dict(cached["tables"])
+
+    return load_cached(key, None, signature, lambda: read_file(file_path), cache_dir)
+
+def read_file(file_path: str) -> bytes:
+    '''This method is used to read the content of a file'''
+
+    with open(file_path, "rb") as file:
+        return file.read()
+
+def load_cached(key: str, digest, signature, read, cache_dir) -> dict:
+    '''This method is used to get the tables from the cache or parse and cache them'''
+
+    cache_path = os.path.join(cache_dir, f"{key}.json") if cache_dir else None
+    cached = _memory_cache.get(key)
+    if cached is None and cache_path and os.path.exists(cache_path):
+        cached = read_cache_file(cache_path)
+
+    if cached is not None and cached["signature"] == signature:
+        _memory_cache[key] = cached
+        return dict(cached["tables"])
+
+    content = read()
+    digest = digest or hashlib.sha1(content).hexdigest()
+    if cached is None or cached["digest"] != digest:
+        cached = {"digest": digest, "tables": parse_workbook(io.BytesIO(content))}
+
+    cached["signature"] = signature
+    _memory_cache[key] = cached
+    if cache_path:
+        write_cache_file(cache_path, cached)
+
+    return dict(cached["tables"])
+
+def read_cache_file(cache_path: str):
+    '''This method is used to read a cache file, None if it is not a valid cache'''
+
+    try:
+        with open(cache_path, "r", encoding="UTF-8") as file:
+            data = json.load(file)
+        if data["version"] != CACHE_VERSION:
+            return None
+
+        signature = data["signature"]
+        tables = {}
+        for table_data in data["tables"]:
+            table = Table.from_json(table_data)
+            tables[table.name] = table
+
+        return {"digest": str(data["digest"]), "tables": tables,
+                "signature": tuple(signature) if signature is not None else None}
+    except (OSError, ValueError, TypeError, KeyError, AttributeError, OverflowError):
+        return None
+
+def write_cache_file(cache_path: str, cached: dict):
+    '''This method is used to write a cache file inside a folder only the user can access'''
+
+    cache_dir = os.path.dirname(cache_path)
+    try:
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+        data = {"version": CACHE_VERSION, "digest": cached["digest"],
+                "signature": cached["signature"],
+                "tables": [table.to_json() for table in cached["tables"].values()]}
+        with tempfile.NamedTemporaryFile("w", encoding="UTF-8", dir=cache_dir,
+                                         suffix=".tmp", delete=False) as file:
+            json.dump(data, file)
+        os.replace(file.name, cache_path)
+    except OSError as e:
+        print(f"Error: {str(e)}")
+
+def parse_workbook(file) -> dict:
+    '''This method is used to parse every sheet of a workbook into a table'''
+
+    with zipfile.ZipFile(file) as archive:
+        names = set(archive.namelist())
+        workbook = ET.fromstring(archive.read("xl/workbook.xml"))
+        relations = ET.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+        targets = {relation.get("Id"): relation.get("Target")
+                   for relation in relations.iter(f"{PKG_REL_NS}Relationship")}
+
+        properties = workbook.find(f"{MAIN_NS}workbookPr")
+        date1904 = properties is not None and properties.get("date1904") in ("1", "true")
+        epoch = datetime.datetime(1904, 1, 1) if date1904 else datetime.datetime(1899, 12, 30)
+
+        shared = read_shared_strings(archive) if "xl/sharedStrings.xml" in names else []
+        date_styles = read_date_styles(archive) if "xl/styles.xml" in names else set()
+
+        tables = {}
+        for sheet in workbook.iter(f"{MAIN_NS}sheet"):
+            target = targets[sheet.get(f"{REL_NS}id")]
+            part = target.lstrip("/") if target.startswith("/") else \
+                posixpath.normpath(posixpath.join("xl", target))
+            with archive.open(part) as sheet_file:
+                grid = read_sheet(sheet_file, shared, date_styles, epoch)
+            tables[sheet.get("name")] = grid_to_table(sheet.get("name"), grid)
+
+    return tables
+
+def read_shared_strings(archive: zipfile.ZipFile) -> list:
+    '''This method is used to read the shared strings of a workbook'''
+
+    strings = []
+    with archive.open("xl/sharedStrings.xml") as file:
+        for _, element in ET.iterparse(file):
+            if element.tag == f"{MAIN_NS}si":
+                # Rich text is split in runs, phonetic guides (rPh) are not part of the text
+                strings.append("".join(
+                    (child.text or "") if child.tag == f"{MAIN_NS}t"
+                    else child.findtext(f"{MAIN_NS}t", "") if child.tag == f"{MAIN_NS}r"
+                    else "" for child in element))
+                element.clear()
+
+    return strings
+
+def read_date_styles(archive: zipfile.ZipFile) -> set:
+    '''This method is used to get the indexes of the cell styles that format dates'''
+
+    styles = ET.fromstring(archive.read("xl/styles.xml"))
+    custom = {int(fmt.get("numFmtId")): fmt.get("formatCode", "")
+              for fmt in styles.iter(f"{MAIN_NS}numFmt")}
+
+    date_styles = set()
+    cell_xfs = styles.find(f"{MAIN_NS}cellXfs")
+    for index, xf in enumerate(cell_xfs if cell_xfs is not None else []):
+        format_id = int(xf.get("numFmtId", 0))
+        if format_id in DATE_FORMAT_IDS or is_date_format(custom.get(format_id, "")):
+            date_styles.add(index)
+
+    return date_styles
+
+def is_date_format(format_code: str) -> bool:
+    '''This method is used to check if a custom number format displays a date or time'''
+
+    code = re.sub(r'"[^"]*"|\\.|\[[^\]]*\]', "", format_code.split(";")[0])
+    return bool(re.search(r"[dmyhs]", code, re.IGNORECASE))
+
+def read_sheet(file, shared: list, date_styles: set, epoch: datetime.datetime) -> dict:
+    '''This method is used to read the cell values of a sheet
+
+    The ``r`` attributes of rows and cells are optional, when they are missing the position
+    follows the previous row or cell.
+
+    Returns
+    -------
+    dict
+        The values of each row by row number, each one a dict by column number
+    '''
+
+    grid = {}
+    row_number = 0
+    column = 0
+    for event, element in ET.iterparse(file, events=("start", "end")):
+        if element.tag == f"{MAIN_NS}row":
+            if event == "start":
+                row_number = int(element.get("r") or row_number + 1)
+                column = 0
+            else:
+                element.clear()
+            continue
+        if event != "end" or element.tag != f"{MAIN_NS}c":
+            continue
+
+        reference = element.get("r", "")
+        letters = reference.rstrip("0123456789")
+        if reference[len(letters):]:
+            row_number = int(reference[len(letters):])
+        if letters:
+            column = 0
+            for letter in letters.upper():
+                column = column * 26 + ord(letter) - 64
+        else:
+            column += 1
+
+        value = cell_value(element, shared, date_styles, epoch)
+        if value is not None:
+            grid.setdefault(row_number, {})[column] = value
+
+    return grid
+
+def cell_value(cell: ET.Element, shared: list, date_styles: set, epoch: datetime.datetime):
+    '''This method is used to convert the XML of a cell to its Python value'''
+
+    cell_type = cell.get("t", "n")
+    if cell_type == "inlineStr":
+        return "".join(text.text or "" for text in cell.iter(f"{MAIN_NS}t"))
+
+    raw = cell.findtext(f"{MAIN_NS}v")
+    if raw is None or cell_type == "e":
+        return None
+    if cell_type == "s":
+        return shared[int(raw)]
+    if cell_type == "b":
+        return raw == "1"
+    if cell_type == "str":
+        return raw
+    if cell_type == "d":
+        try:
+            return datetime.datetime.fromisoformat(raw)
+        except ValueError:
+            return raw
+
+    number = int(raw) if raw.lstrip("-").isdigit() else float(raw)
+    if int(cell.get("s", 0)) in date_styles:
+        return epoch + datetime.timedelta(days=number)
+
+    return number
+
+def grid_to_table(name: str, grid: dict) -> Table:
+    '''This method is used to turn the first row of a sheet into headers and the rest into
+    a table'''
+
+    if not grid:
+        return Table(name, [], [], [])
+
+    # Same rule as Consolidator.read_header: row 1 over the full width of the sheet
+    width = max(max(cells) for cells in grid.values())
+    header = grid.get(1, {})
+    columns = normalize_headers([header.get(column) for column in range(1, width + 1)])
+    columns += [""] * (width - len(columns))
+
+    rows = [[grid[number].get(column) for column in range(1, width + 1)]
+            for number in sorted(grid) if number > 1]
+
+    return Table.from_rows(name, columns, rows)